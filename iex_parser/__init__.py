@@ -1,11 +1,12 @@
 """iex_parser"""
 
 from .parser import Parser
-from .messages import DEEP_1_0, TOPS_1_6, TOPS_1_5
+from .messages import DEEP_1_0, TOPS_1_6, TOPS_1_5, use_decimal_prices
 
 __all__ = [
     'Parser',
     'DEEP_1_0',
     'TOPS_1_5',
-    'TOPS_1_6'
+    'TOPS_1_6',
+    'use_decimal_prices'
 ]
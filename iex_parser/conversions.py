@@ -1,6 +1,11 @@
 """Conversions"""
 
-from typing import Mapping, List
+from typing import Mapping, Tuple
+
+# These lookup tables are keyed by the raw byte values the decoders
+# emit. CPython interns single-byte bytes objects, so the decoders
+# allocate nothing for these fields and the keys hash as cheaply as
+# small ints; rekeying by ordinal would only break the message API.
 
 SYSTEM_EVENT_TYPES: Mapping[bytes, str] = {
     b'O': "start_of_messages",
@@ -18,7 +23,7 @@ LULD_TIER = {
 }
 
 
-def from_security_directory_flags(flags: int) -> List[str]:
+def _security_directory_flag_set(flags: int) -> Tuple[str, ...]:
     flag_set = []
     if flags & 0x80 != 0:
         flag_set.append('test')
@@ -26,7 +31,18 @@ def from_security_directory_flags(flags: int) -> List[str]:
         flag_set.append('when_issued')
     if flags & 0x20 != 0:
         flag_set.append('etp')
-    return flag_set
+    return tuple(flag_set)
+
+
+# The flags fit in a byte, so every combination is computed up front and
+# the conversion becomes a single index into a shared tuple.
+_SECURITY_DIRECTORY_FLAGS = tuple(
+    _security_directory_flag_set(flags) for flags in range(256)
+)
+
+
+def from_security_directory_flags(flags: int) -> Tuple[str, ...]:
+    return _SECURITY_DIRECTORY_FLAGS[flags]
 
 
 TRADING_STATUS_MESSAGES = {
@@ -37,7 +53,7 @@ TRADING_STATUS_MESSAGES = {
 }
 
 
-def from_sale_condition_flags(flags: int) -> List[str]:
+def _sale_condition_flag_set(flags: int) -> Tuple[str, ...]:
     flag_set = []
     if flags & 0x80 != 0:
         flag_set.append('iso')
@@ -49,7 +65,16 @@ def from_sale_condition_flags(flags: int) -> List[str]:
         flag_set.append('trade_through_excempt')
     if flags & 0x08 != 0:
         flag_set.append('single_price_cross')
-    return flag_set
+    return tuple(flag_set)
+
+
+_SALE_CONDITION_FLAGS = tuple(
+    _sale_condition_flag_set(flags) for flags in range(256)
+)
+
+
+def from_sale_condition_flags(flags: int) -> Tuple[str, ...]:
+    return _SALE_CONDITION_FLAGS[flags]
 
 
 def is_last_sale_eligable(flags: int) -> bool:
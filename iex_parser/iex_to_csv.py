@@ -1,22 +1,49 @@
 """Convert an IEX file to CSV files"""
 
 import argparse
+from concurrent.futures import Future, ThreadPoolExecutor
+import csv
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
 import gzip
+import io
 import logging
 from pathlib import Path
 import re
 import sys
-from typing import Any, Callable, Dict, IO, List, Mapping, Optional
+from typing import Any, Callable, Dict, IO, Iterator, List, Mapping, Optional, Sequence, Union
 
 from iex_parser import Parser, DEEP_1_0, TOPS_1_5, TOPS_1_6
 
 # data_feeds_20200305_20200305_IEXTP1_DEEP1.0.pcap.gz
 FILENAME_REGEX = re.compile(
-    r"data_feeds_(?P<start_date>\d{8})_(?P<end_date>\d{8})_(?P<protocol>[^_]+)_(?P<feed>(DEEP|TOPS))(?P<version>\d+\.\d+)\.pcap\.gz"
+    r"data_feeds_"
+    r"(?P<start_date>(?P<sy>\d{4})(?P<sm>\d{2})(?P<sd>\d{2}))_"
+    r"(?P<end_date>(?P<ey>\d{4})(?P<em>\d{2})(?P<ed>\d{2}))_"
+    r"(?P<protocol>[^_]+)_(?P<feed>(DEEP|TOPS))(?P<version>\d+\.\d+)\.pcap\.gz"
 )
 
 
+# gzip uses small default buffers; giving the underlying file a much
+# larger one means fewer syscalls on multi-gigabyte compressed files.
+GZIP_BUFFER_SIZE = 128 * 1024
+
+# Rows are buffered and written in batches to amortize the per-call
+# overhead of the compressor.
+CSV_BATCH_SIZE = 4096
+
+
+@contextmanager
+def gzip_open_write(filename: Union[str, Path]) -> Iterator[IO[str]]:
+    with open(filename, 'wb', buffering=GZIP_BUFFER_SIZE) as file_ptr:
+        with gzip.GzipFile(fileobj=file_ptr, mode='wb') as gzip_ptr:
+            text_ptr = io.TextIOWrapper(gzip_ptr)
+            try:
+                yield text_ptr
+            finally:
+                text_ptr.flush()
+
+
 def int_to_str(value: int) -> str:
     return str(value)
 
@@ -26,7 +53,7 @@ def decimal_to_str(value: int) -> str:
 
 
 def bytes_to_str(value: bytes) -> str:
-    return '"' + value.decode() + '"'
+    return value.decode()
 
 
 def timestamp_to_str(value: datetime) -> str:
@@ -148,6 +175,145 @@ FILE_FORMATS: Mapping[str, Mapping[str, Callable[[Any], str]]] = {
 }
 
 
+_CSV_FILENAMES: Mapping[str, str] = {
+    'security_directive': 'security_directory',
+    'trading_status': 'trading_status',
+    'retail_liquidity_indicator': 'retail_liquidity_indicator',
+    'operational_halt': 'operational_halt',
+    'short_sale_price_test_status': 'short_sale_price_test_status',
+    'quote_update': 'quote_update',
+    'trade_report': 'trade_report',
+    'official_price': 'official_price',
+    'trade_break': 'trade_break',
+    'auction_information': 'auction_information',
+    'price_level_update': 'price_level_update',
+    'security_event': 'security_event',
+    'system_event': 'system_event'
+}
+
+_MESSAGE_TYPES_TOPS_1_5 = (
+    'quote_update',
+    'trade_report',
+    'trade_break'
+)
+
+_MESSAGE_TYPES_DEEP_1_0 = (
+    'security_directive',
+    'trading_status',
+    'retail_liquidity_indicator',
+    'operational_halt',
+    'short_sale_price_test_status',
+    'quote_update',
+    'trade_report',
+    'official_price',
+    'trade_break',
+    'auction_information',
+    'price_level_update',
+    'security_event',
+    'system_event'
+)
+
+
+def _convert_messages(
+        filename: Path,
+        output_folder: Path,
+        tickers: List[bytes],
+        is_silent: bool,
+        is_timestamp_ordinal,
+        root_filename: str,
+        message_types: Sequence[str],
+        feed_def: str
+) -> None:
+    # Symbols in decoded messages are stripped, so strip the filter
+    # too, and use a frozenset for O(1) membership.
+    ticker_set = frozenset(ticker.strip() for ticker in tickers)
+    ordinal = 0
+    # next_log replaces a per-message "not is_silent and % 1000" check
+    # with a single comparison; when silent it is simply never reached.
+    message_count = 0
+    next_log = sys.maxsize if is_silent else 1000
+    previous_timestamp: Optional[datetime] = None
+    with ExitStack() as stack:
+        reader = stack.enter_context(Parser(str(filename), feed_def))
+        file_ptr_map: Dict[str, IO[Any]] = {
+            message_type: stack.enter_context(gzip_open_write(
+                output_folder /
+                (root_filename + _CSV_FILENAMES[message_type] + '.csv.gz')
+            ))
+            for message_type in message_types
+        }
+        writer_map = {
+            message_type: csv.writer(file_ptr, lineterminator='\n')
+            for message_type, file_ptr in file_ptr_map.items()
+        }
+        for message_type, writer in writer_map.items():
+            writer.writerow(FILE_FORMATS[message_type].keys())
+
+        # One worker per message type keeps each file's writes ordered
+        # while letting gzip compression (which releases the GIL) run
+        # in parallel with decoding. Executors are entered after the
+        # files so they drain before the files close.
+        executor_map = {
+            message_type: stack.enter_context(ThreadPoolExecutor(max_workers=1))
+            for message_type in file_ptr_map
+        }
+
+        dispatch = {
+            message_type: (
+                [],
+                writer_map[message_type],
+                executor_map[message_type],
+                tuple(FILE_FORMATS[message_type].items())
+            )
+            for message_type in file_ptr_map
+        }
+
+        # One future per type stays in flight; collecting the previous
+        # result before submitting the next batch surfaces any worker
+        # failure instead of silently dropping it.
+        pending: Dict[str, Future] = {}
+
+        for message in reader:
+            symbol = message.get('symbol')
+            if ticker_set and symbol is not None and symbol not in ticker_set:
+                if not is_silent:
+                    print(f"Skipping {symbol}", file=sys.stderr)
+                continue
+
+            timestamp = message['timestamp']
+            if is_timestamp_ordinal and previous_timestamp != timestamp:
+                ordinal = 0
+            ordinal += 1
+            message['ordinal'] = ordinal
+            previous_timestamp = timestamp
+
+            message_count += 1
+            if message_count == next_log:
+                print(
+                    f"{timestamp.isoformat()} ({message_count})",
+                    file=sys.stderr
+                )
+                next_log += 1000
+
+            message_type = message['type']
+            rows, writer, executor, formats = dispatch[message_type]
+            rows.append([fmt(message[name]) for name, fmt in formats])
+            if len(rows) >= CSV_BATCH_SIZE:
+                future = pending.get(message_type)
+                if future is not None:
+                    future.result()
+                pending[message_type] = executor.submit(
+                    writer.writerows, rows[:])
+                rows.clear()
+
+        for message_type, (rows, writer, _executor, _formats) in dispatch.items():
+            future = pending.get(message_type)
+            if future is not None:
+                future.result()
+            if rows:
+                writer.writerows(rows)
+
+
 def _convert_tops_1_5(
         filename: Path,
         output_folder: Path,
@@ -162,49 +328,16 @@ def _convert_tops_1_5(
         feed_def: str
 ) -> None:
     root_filename = f'data_feed_{start_date:%Y%m%d}_{end_date:%Y%m%d}_{protocol}_{feed}{version}_'
-    quote_update_filename = root_filename + 'quote_update.csv.gz'
-    trade_report_filename = root_filename + 'trade_report.csv.gz'
-    trade_break_filename = root_filename + 'trade_break.csv.gz'
-
-    file_ptr_map: Dict[str, IO[Any]] = {}
-    ordinal = 0
-    previous_timestamp: Optional[datetime] = None
-    with Parser(str(filename), feed_def) as reader:
-        with gzip.open(output_folder / quote_update_filename, "wt") as file_ptr_map['quote_update']:
-            print(",".join(FILE_FORMATS['quote_update'].keys(
-            )), file=file_ptr_map['quote_update'])
-            with gzip.open(output_folder / trade_report_filename, "wt") as file_ptr_map['trade_report']:
-                print(",".join(FILE_FORMATS['trade_report'].keys(
-                )), file=file_ptr_map['trade_report'])
-                with gzip.open(output_folder / trade_break_filename, "wt") as file_ptr_map['trade_break']:
-                    print(",".join(FILE_FORMATS['trade_break'].keys(
-                    )), file=file_ptr_map['trade_break'])
-
-                    for message in reader:
-                        if is_timestamp_ordinal and previous_timestamp != message['timestamp']:
-                            ordinal = 0
-                        ordinal += 1
-                        message['ordinal'] = ordinal
-                        previous_timestamp = message['timestamp']
-
-                        if not is_silent and ordinal % 1000 == 0:
-                            print(
-                                f"{message['timestamp'].isoformat()} ({ordinal})", file=sys.stderr)
-
-                        if tickers and 'symbol' in message and message['symbol'] not in tickers:
-                            if not is_silent:
-                                print(
-                                    f"Skipping {message['symbol']}", file=sys.stderr)
-                            continue
-
-                        file_ptr = file_ptr_map[message['type']]
-                        formats = FILE_FORMATS[message['type']]
-                        data = [
-                            fmt(message[name])
-                            for name, fmt in formats.items()
-                        ]
-                        print(
-                            ",".join(data), file=file_ptr)
+    _convert_messages(
+        filename,
+        output_folder,
+        tickers,
+        is_silent,
+        is_timestamp_ordinal,
+        root_filename,
+        _MESSAGE_TYPES_TOPS_1_5,
+        feed_def
+    )
 
 
 def _convert_deep_1_0_and_tops_1_6(
@@ -221,167 +354,16 @@ def _convert_deep_1_0_and_tops_1_6(
         feed_def: str
 ) -> None:
     root_filename = f'data_feed_{start_date:%Y%m%d}_{end_date:%Y%m%d}_{protocol}_{feed}{version}_'
-    security_directory_filename = root_filename + 'security_directory.csv.gz'
-    trading_status_filename = root_filename + 'trading_status.csv.gz'
-    retail_liquidity_indicator_filename = root_filename + 'retail_liquidity_indicator.csv.gz'
-    operational_halt_filename = root_filename + 'operational_halt.csv.gz'
-    short_sale_price_test_status_filename = root_filename + \
-        'short_sale_price_test_status.csv.gz'
-    security_event_filename = root_filename + 'security_event.csv.gz'
-    quote_update_filename = root_filename + 'quote_update.csv.gz'
-    price_level_update_filename = root_filename + 'price_level_update.csv.gz'
-    trade_report_filename = root_filename + 'trade_report.csv.gz'
-    official_price_filename = root_filename + 'official_price.csv.gz'
-    trade_break_filename = root_filename + 'trade_break.csv.gz'
-    auction_information_filename = root_filename + 'auction_information.csv.gz'
-    system_event_filename = root_filename + 'system_event.csv.gz'
-
-    file_ptr_map: Dict[str, IO[Any]] = {}
-    ordinal = 0
-    previous_timestamp: Optional[datetime] = None
-    with Parser(str(filename), feed_def) as reader:
-        with gzip.open(
-                output_folder / security_directory_filename,
-                "wt"
-        ) as file_ptr_map['security_directive']:
-            print(
-                ",".join(FILE_FORMATS['security_directive'].keys()),
-                file=file_ptr_map['security_directive']
-            )
-            with gzip.open(
-                    output_folder / trading_status_filename,
-                    "wt"
-            ) as file_ptr_map['trading_status']:
-                print(
-                    ",".join(FILE_FORMATS['trading_status'].keys()),
-                    file=file_ptr_map['trading_status']
-                )
-                with gzip.open(
-                        output_folder / retail_liquidity_indicator_filename,
-                        "wt"
-                ) as file_ptr_map['retail_liquidity_indicator']:
-                    print(
-                        ",".join(FILE_FORMATS['retail_liquidity_indicator'].keys()),
-                        file=file_ptr_map['retail_liquidity_indicator']
-                    )
-                    with gzip.open(
-                            output_folder / operational_halt_filename,
-                            "wt"
-                    ) as file_ptr_map['operational_halt']:
-                        print(
-                            ",".join(FILE_FORMATS['operational_halt'].keys()),
-                            file=file_ptr_map['operational_halt']
-                        )
-                        with gzip.open(
-                                output_folder / short_sale_price_test_status_filename,
-                                "wt"
-                        ) as file_ptr_map['short_sale_price_test_status']:
-                            print(
-                                ",".join(
-                                    FILE_FORMATS['short_sale_price_test_status'].keys()),
-                                file=file_ptr_map['short_sale_price_test_status']
-                            )
-                            with gzip.open(
-                                    output_folder / quote_update_filename,
-                                    "wt"
-                            ) as file_ptr_map['quote_update']:
-                                print(
-                                    ",".join(FILE_FORMATS['quote_update'].keys()),
-                                    file=file_ptr_map['quote_update']
-                                )
-                                with gzip.open(
-                                        output_folder / trade_report_filename,
-                                        "wt"
-                                ) as file_ptr_map['trade_report']:
-                                    print(
-                                        ",".join(
-                                            FILE_FORMATS['trade_report'].keys()),
-                                        file=file_ptr_map['trade_report']
-                                    )
-                                    with gzip.open(
-                                            output_folder / official_price_filename,
-                                            "wt"
-                                    ) as file_ptr_map['official_price']:
-                                        print(
-                                            ",".join(
-                                                FILE_FORMATS['official_price'].keys()),
-                                            file=file_ptr_map['official_price']
-                                        )
-                                        with gzip.open(
-                                                output_folder / trade_break_filename,
-                                                "wt"
-                                        ) as file_ptr_map['trade_break']:
-                                            print(
-                                                ",".join(
-                                                    FILE_FORMATS['trade_break'].keys()),
-                                                file=file_ptr_map['trade_break']
-                                            )
-                                            with gzip.open(
-                                                    output_folder / auction_information_filename,
-                                                    "wt"
-                                            ) as file_ptr_map['auction_information']:
-                                                print(
-                                                    ",".join(
-                                                        FILE_FORMATS['auction_information'].keys()),
-                                                    file=file_ptr_map['auction_information']
-                                                )
-                                                with gzip.open(
-                                                        output_folder / price_level_update_filename,
-                                                        "wt"
-                                                ) as file_ptr_map['price_level_update']:
-                                                    print(
-                                                        ",".join(
-                                                            FILE_FORMATS['price_level_update'].keys()),
-                                                        file=file_ptr_map['price_level_update']
-                                                    )
-                                                    with gzip.open(
-                                                            output_folder / security_event_filename,
-                                                            "wt"
-                                                    ) as file_ptr_map['security_event']:
-                                                        print(
-                                                            ",".join(
-                                                                FILE_FORMATS['security_event'].keys(
-                                                                )
-                                                            ),
-                                                            file=file_ptr_map['security_event']
-                                                        )
-                                                        with gzip.open(
-                                                                output_folder / system_event_filename,
-                                                                "wt"
-                                                        ) as file_ptr_map['system_event']:
-                                                            print(
-                                                                ",".join(
-                                                                    FILE_FORMATS['system_event'].keys(
-                                                                    )
-                                                                ),
-                                                                file=file_ptr_map['system_event']
-                                                            )
-
-                                                            for message in reader:
-                                                                if is_timestamp_ordinal and previous_timestamp != message['timestamp']:
-                                                                    ordinal = 0
-                                                                ordinal += 1
-                                                                message['ordinal'] = ordinal
-                                                                previous_timestamp = message['timestamp']
-
-                                                                if not is_silent and ordinal % 1000 == 0:
-                                                                    print(
-                                                                        f"{message['timestamp'].isoformat()} ({ordinal})", file=sys.stderr)
-
-                                                                if tickers and 'symbol' in message and message['symbol'] not in tickers:
-                                                                    if not is_silent:
-                                                                        print(
-                                                                            f"Skipping {message['symbol']}", file=sys.stderr)
-                                                                    continue
-
-                                                                file_ptr = file_ptr_map[message['type']]
-                                                                formats = FILE_FORMATS[message['type']]
-                                                                data = [
-                                                                    fmt(message[name])
-                                                                    for name, fmt in formats.items()
-                                                                ]
-                                                                print(
-                                                                    ",".join(data), file=file_ptr)
+    _convert_messages(
+        filename,
+        output_folder,
+        tickers,
+        is_silent,
+        is_timestamp_ordinal,
+        root_filename,
+        _MESSAGE_TYPES_DEEP_1_0,
+        feed_def
+    )
 
 
 def convert(
@@ -397,8 +379,9 @@ def convert(
         raise ValueError('Unable to process filename')
 
     dct = matches.groupdict()
-    start_date = datetime.strptime(dct['start_date'], '%Y%m%d')
-    end_date = datetime.strptime(dct['end_date'], '%Y%m%d')
+    # Building the dates directly avoids strptime's format interpreter.
+    start_date = datetime(int(dct['sy']), int(dct['sm']), int(dct['sd']))
+    end_date = datetime(int(dct['ey']), int(dct['em']), int(dct['ed']))
     protocol: str = dct['protocol']
     feed: str = dct['feed']
     version: str = dct['version']
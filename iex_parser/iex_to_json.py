@@ -3,15 +3,24 @@
 import argparse
 from datetime import datetime
 from decimal import Decimal
-import gzip
 import json
 import logging
 from pathlib import Path
 import sys
-from typing import Any, Iterator, List, Mapping
+import zlib
+from typing import Any, Iterator, List, Mapping, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from iex_parser import Parser, DEEP_1_0, TOPS_1_5, TOPS_1_6
-from iex_parser.iex_to_csv import FILENAME_REGEX
+from iex_parser.iex_to_csv import (
+    FILENAME_REGEX,
+    GZIP_BUFFER_SIZE,
+    gzip_open_write
+)
 
 
 class JSONEncoderEx(json.JSONEncoder):
@@ -28,6 +37,28 @@ class JSONEncoderEx(json.JSONEncoder):
             return json.JSONEncoder.default(self, obj)
 
 
+def _to_jsonable(message: Mapping[str, Any]) -> Mapping[str, Any]:
+    # One walk over the dict up front keeps the encoder on its C fast
+    # path, rather than calling back into Python per awkward field.
+    return {
+        key: (
+            float(value) if isinstance(value, Decimal)
+            else value.decode() if isinstance(value, bytes)
+            else value.isoformat() if isinstance(value, datetime)
+            else value
+        )
+        for key, value in message.items()
+    }
+
+
+if orjson is not None:
+    def _dumps(message: Mapping[str, Any]) -> str:
+        return orjson.dumps(_to_jsonable(message)).decode()
+else:
+    def _dumps(message: Mapping[str, Any]) -> str:
+        return json.dumps(_to_jsonable(message))
+
+
 def convert(filename: Path, output_path: Path, tickers: List[bytes], is_silent: bool):
     matches = FILENAME_REGEX.match(filename.name)
 
@@ -35,8 +66,9 @@ def convert(filename: Path, output_path: Path, tickers: List[bytes], is_silent:
         raise ValueError('Unable to process filename')
 
     dct = matches.groupdict()
-    start_date = datetime.strptime(dct['start_date'], '%Y%m%d')
-    end_date = datetime.strptime(dct['end_date'], '%Y%m%d')
+    # Building the dates directly avoids strptime's format interpreter.
+    start_date = datetime(int(dct['sy']), int(dct['sm']), int(dct['sd']))
+    end_date = datetime(int(dct['ey']), int(dct['em']), int(dct['ed']))
     protocol = dct['protocol']
     feed = dct['feed']
     version = dct['version']
@@ -54,68 +86,118 @@ def convert(filename: Path, output_path: Path, tickers: List[bytes], is_silent:
     else:
         raise ValueError(f'Unknown protocol {feed} {version}')
 
+    # Symbols in decoded messages are stripped, so strip the filter
+    # too, and use a frozenset for O(1) membership.
+    ticker_set = frozenset(ticker.strip() for ticker in tickers)
     line_number = 0
+    # next_log replaces a per-message "not is_silent and % 1000" check
+    # with a single comparison; when silent it is simply never reached.
+    next_log = sys.maxsize if is_silent else 1000
     with Parser(str(filename), feed_def) as reader:
-        with gzip.open(output_path, 'wt') as file_ptr:
+        with gzip_open_write(output_path) as file_ptr:
             for message in reader:
+                symbol = message.get('symbol')
+                if ticker_set and symbol is not None and symbol not in ticker_set:
+                    if not is_silent:
+                        print(f"Skipping {symbol}", file=sys.stderr)
+                    continue
+
                 line_number += 1
 
-                if not is_silent and line_number % 1000 == 0:
+                if line_number == next_log:
                     print(
                         f"{message['timestamp'].isoformat()} ({line_number})",
                         file=sys.stderr
                     )
+                    next_log += 1000
+
+                print(_dumps(message), file=file_ptr)
+
+
+
+def _iter_gzip_lines(input_file: Path) -> Iterator[bytes]:
+    # Sequential line iteration doesn't need GzipFile's seek and text
+    # layer bookkeeping; feeding zlib directly and splitting lines per
+    # chunk is substantially faster.
+    with open(input_file, 'rb', buffering=GZIP_BUFFER_SIZE) as file_ptr:
+        decompressor = zlib.decompressobj(wbits=31)
+        # Tracks whether the active decompressor has consumed any bytes
+        # since the last member boundary, so a truncated file can be
+        # told apart from a clean end-of-member at EOF.
+        is_mid_member = False
+        tail = b''
+        while True:
+            chunk = file_ptr.read(GZIP_BUFFER_SIZE)
+            if not chunk:
+                break
+            data = tail + decompressor.decompress(chunk)
+            is_mid_member = True
+            # A gzip file may contain multiple members.
+            while decompressor.eof:
+                unused = decompressor.unused_data
+                decompressor = zlib.decompressobj(wbits=31)
+                if not unused:
+                    is_mid_member = False
+                    break
+                data += decompressor.decompress(unused)
+            lines = data.split(b'\n')
+            tail = lines.pop()
+            for line in lines:
+                yield line
+        if is_mid_member and not decompressor.eof:
+            raise EOFError(
+                'Compressed file ended before the end-of-stream marker '
+                'was reached'
+            )
+        tail += decompressor.flush()
+        if tail:
+            yield tail
+
+
+_BYTES_FIELDS: Mapping[str, Tuple[str, ...]] = {
+    'system_event': ('event',),
+    'security_directive': ('symbol',),
+    'trading_status': ('status', 'symbol', 'reason'),
+    'retail_liquidity_indicator': ('indicator', 'symbol'),
+    'operational_halt': ('halt_status', 'symbol'),
+    'short_sale_price_test_status': ('symbol', 'detail'),
+    'quote_update': ('symbol',),
+    'trade_report': ('symbol',),
+    'official_price': ('price_type', 'symbol'),
+    'trade_break': ('symbol',),
+    'auction_information': ('auction_type', 'symbol', 'imbalance_side'),
+    'price_level_update': ('side', 'symbol'),
+    'security_event': ('security_event', 'symbol')
+}
+
+
+def load_json(
+        input_file: Path,
+        decimal: bool = False,
+        as_bytes: bool = False
+) -> Iterator[Mapping[str, Any]]:
+    if decimal:
+        # parse_float calls back into Python for every numeric field;
+        # only pay for that when exact prices are asked for.
+        def _loads(line: bytes) -> Any:
+            return json.loads(line, parse_float=Decimal)
+    else:
+        _loads = json.loads
 
-                if tickers and 'symbol' in message and message['symbol'] not in tickers:
-                    if not is_silent:
-                        print(f"Skipping {message['symbol']}", file=sys.stderr)
-                    continue
+    for line in _iter_gzip_lines(input_file):
+        obj = _loads(line)
+
+        obj['timestamp'] = datetime.fromisoformat(obj['timestamp'])
+        obj_type = obj['type']
+        if obj_type == 'auction_information':
+            obj['scheduled_auction_time'] = datetime.fromisoformat(
+                obj['scheduled_auction_time'])
+
+        if as_bytes:
+            for field in _BYTES_FIELDS[obj_type]:
+                obj[field] = obj[field].encode()
 
-                print(json.dumps(message, cls=JSONEncoderEx), file=file_ptr)
-
-
-def load_json(input_file: Path) -> Iterator[Mapping[str, Any]]:
-    with gzip.open(input_file, 'rt') as file_ptr:
-        for line in file_ptr:
-            obj = json.loads(line, parse_float=Decimal)
-
-            obj['timestamp'] = datetime.fromisoformat(obj['timestamp'])
-
-            if obj['type'] == 'security_directive':
-                obj['symbol'] = obj['symbol'].encode()
-            elif obj['type'] == 'trading_status':
-                obj['status'] = obj['status'].encode()
-                obj['symbol'] = obj['symbol'].encode()
-                obj['reason'] = obj['reason'].encode()
-            elif obj['type'] == 'retail_liquidity_indicator':
-                obj['status'] = obj['indicator'].encode()
-                obj['symbol'] = obj['symbol'].encode()
-            elif obj['type'] == 'operational_halt':
-                obj['halt_status'] = obj['halt_status'].encode()
-                obj['symbol'] = obj['symbol'].encode()
-            elif obj['type'] == 'short_sale_price_test_status':
-                obj['symbol'] = obj['symbol'].encode()
-                obj['detail'] = obj['detail'].encode()
-            elif obj['type'] == 'quote_update':
-                obj['symbol'] = obj['symbol'].encode()
-            elif obj['type'] == 'trade_report':
-                obj['symbol'] = obj['symbol'].encode()
-            elif obj['type'] == 'official_price':
-                obj['price_type'] = obj['price_type'].encode()
-                obj['symbol'] = obj['symbol'].encode()
-            elif obj['type'] == 'trade_break':
-                obj['symbol'] = obj['symbol'].encode()
-            elif obj['type'] == 'auction_information':
-                obj['scheduled_auction_time'] = datetime.fromisoformat(
-                    obj['scheduled_auction_time'])
-            elif obj['type'] == 'price_level_update':
-                obj['side'] = obj['side'].encode()
-                obj['symbol'] = obj['symbol'].encode()
-            elif obj['type'] == 'security_event':
-                obj['security_event'] = obj['security_event'].encode()
-                obj['symbol'] = obj['symbol'].encode()
-
-            yield obj
+        yield obj
 
 
 def parse_args(args):
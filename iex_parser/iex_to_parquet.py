@@ -0,0 +1,249 @@
+"""Convert an IEX DEEP or TOPS file to Parquet files"""
+
+import argparse
+from contextlib import ExitStack
+from datetime import datetime
+import logging
+from pathlib import Path
+import sys
+from typing import Any, Dict, List, Mapping
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from iex_parser import Parser, DEEP_1_0, TOPS_1_5, TOPS_1_6
+from iex_parser.iex_to_csv import (
+    FILENAME_REGEX,
+    FILE_FORMATS,
+    bytes_to_str,
+    decimal_to_str,
+    int_to_str,
+    timestamp_to_str,
+    datetime_to_str,
+    _CSV_FILENAMES,
+    _MESSAGE_TYPES_TOPS_1_5,
+    _MESSAGE_TYPES_DEEP_1_0
+)
+
+# Rows are buffered per message type and written as record batches.
+PARQUET_BATCH_SIZE = 64 * 1024
+
+
+def _arrow_type(formatter) -> 'pa.DataType':
+    if formatter is int_to_str:
+        return pa.int64()
+    if formatter is decimal_to_str:
+        return pa.float64()
+    if formatter is bytes_to_str:
+        return pa.string()
+    if formatter is timestamp_to_str:
+        return pa.timestamp('ns', tz='UTC')
+    if formatter is datetime_to_str:
+        return pa.timestamp('s', tz='UTC')
+    raise ValueError(f'Unknown formatter {formatter}')
+
+
+def _schema(message_type: str) -> 'pa.Schema':
+    return pa.schema([
+        (name, _arrow_type(formatter))
+        for name, formatter in FILE_FORMATS[message_type].items()
+        if name != 'ordinal'
+    ])
+
+
+def _int_value(value: Any) -> int:
+    if isinstance(value, bytes):
+        # trade_break flags arrive as a raw byte.
+        return value[0] if value else 0
+    return value
+
+
+def _float_value(value: Any) -> float:
+    return float(value)
+
+
+def _str_value(value: bytes) -> str:
+    return value.decode()
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_CONVERTERS: Mapping[Any, Any] = {
+    int_to_str: _int_value,
+    decimal_to_str: _float_value,
+    bytes_to_str: _str_value,
+    timestamp_to_str: _identity,
+    datetime_to_str: _identity
+}
+
+
+def convert(
+        filename: Path,
+        output_folder: Path,
+        tickers: List[bytes],
+        is_silent: bool
+) -> None:
+    if pa is None:
+        raise ImportError(
+            'pyarrow is required for parquet conversion: '
+            'pip install iex_parser[pyarrow]'
+        )
+
+    matches = FILENAME_REGEX.match(filename.name)
+
+    if not matches:
+        raise ValueError('Unable to process filename')
+
+    dct = matches.groupdict()
+    # Building the dates directly avoids strptime's format interpreter.
+    start_date = datetime(int(dct['sy']), int(dct['sm']), int(dct['sd']))
+    end_date = datetime(int(dct['ey']), int(dct['em']), int(dct['ed']))
+    protocol = dct['protocol']
+    feed = dct['feed']
+    version = dct['version']
+
+    if feed == 'DEEP' and version == '1.0':
+        feed_def = DEEP_1_0
+        message_types = _MESSAGE_TYPES_DEEP_1_0
+    elif feed == 'TOPS' and version == '1.5':
+        feed_def = TOPS_1_5
+        message_types = _MESSAGE_TYPES_TOPS_1_5
+    elif feed == 'TOPS' and version == '1.6':
+        feed_def = TOPS_1_6
+        message_types = _MESSAGE_TYPES_DEEP_1_0
+    else:
+        raise ValueError(f'Unknown protocol {feed} {version}')
+
+    root_filename = f'data_feed_{start_date:%Y%m%d}_{end_date:%Y%m%d}_{protocol}_{feed}{version}_'
+
+    ticker_set = frozenset(ticker.strip() for ticker in tickers)
+    schemas = {
+        message_type: _schema(message_type)
+        for message_type in message_types
+    }
+    fields_map = {
+        message_type: tuple(
+            (name, _CONVERTERS[formatter])
+            for name, formatter in FILE_FORMATS[message_type].items()
+            if name != 'ordinal'
+        )
+        for message_type in message_types
+    }
+    line_number = 0
+    # next_log replaces a per-message "not is_silent and % 1000" check
+    # with a single comparison; when silent it is simply never reached.
+    next_log = sys.maxsize if is_silent else 1000
+    with ExitStack() as stack:
+        reader = stack.enter_context(Parser(str(filename), feed_def))
+        writer_map: Dict[str, 'pq.ParquetWriter'] = {
+            message_type: stack.enter_context(pq.ParquetWriter(
+                output_folder /
+                (root_filename + _CSV_FILENAMES[message_type] + '.parquet'),
+                schemas[message_type]
+            ))
+            for message_type in message_types
+        }
+        columns_map: Dict[str, Dict[str, List[Any]]] = {
+            message_type: {name: [] for name in schemas[message_type].names}
+            for message_type in message_types
+        }
+
+        def _flush(message_type: str) -> None:
+            columns = columns_map[message_type]
+            schema = schemas[message_type]
+            table = pa.table(
+                [columns[name] for name in schema.names],
+                schema=schema
+            )
+            writer_map[message_type].write_table(table)
+            for values in columns.values():
+                values.clear()
+
+        for message in reader:
+            symbol = message.get('symbol')
+            if ticker_set and symbol is not None and symbol not in ticker_set:
+                if not is_silent:
+                    print(f"Skipping {symbol}", file=sys.stderr)
+                continue
+
+            line_number += 1
+
+            if line_number == next_log:
+                print(
+                    f"{message['timestamp'].isoformat()} ({line_number})",
+                    file=sys.stderr
+                )
+                next_log += 1000
+
+            message_type = message['type']
+            columns = columns_map[message_type]
+            for name, converter in fields_map[message_type]:
+                columns[name].append(converter(message[name]))
+
+            if len(columns['timestamp']) >= PARQUET_BATCH_SIZE:
+                _flush(message_type)
+
+        for message_type in message_types:
+            if columns_map[message_type]['timestamp']:
+                _flush(message_type)
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser("IEX to parquet")
+    parser.add_argument(
+        '-i', '--input-file',
+        help='Input filename',
+        action='store',
+        dest='input_filename')
+    parser.add_argument(
+        '-o', '--output-folder',
+        help='Output folder',
+        action='store',
+        dest='output_folder',
+        default='.')
+    parser.add_argument(
+        '-t', '--ticker',
+        help='Add a ticker to record',
+        action='append',
+        dest='tickers',
+        default=[])
+    parser.add_argument(
+        '-s', '--silent',
+        help='Suppress progress report',
+        action='store_true',
+        dest='is_silent',
+        default=False)
+    parser.add_argument(
+        '-v', '--verbose',
+        help='Verbose',
+        action='store_true',
+        dest='is_verbose',
+        default=False)
+    return parser.parse_args(args)
+
+
+def iex_to_parquet():
+    args = parse_args(sys.argv[1:])
+    if args.is_verbose:
+        logging.basicConfig(level=logging.DEBUG)
+    try:
+        convert(
+            Path(args.input_filename),
+            Path(args.output_folder),
+            [ticker.encode() for ticker in args.tickers],
+            args.is_silent
+        )
+        return 0
+    except Exception as error:  # pylint: disable=broad-except
+        print(error, file=sys.stderr)
+        return -1
+
+
+if __name__ == '__main__':
+    iex_to_parquet()
@@ -1,35 +1,148 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 import struct
-from typing import Mapping, Any, Callable
+from typing import Mapping, Any, Callable, List, Optional, Tuple
 
 
-def _from_timestamp(value: int) -> datetime:
-    return datetime.fromtimestamp(value / 10 ** 9, tz=timezone.utc)
+_US_PER_DAY = 24 * 60 * 60 * 10 ** 6
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _make_from_timestamp() -> Callable[[int], datetime]:
+    # Messages in the same packet usually share a timestamp, so a
+    # last-value cache avoids most of the datetime construction. A file
+    # also usually covers a single UTC day, so midnight is cached and
+    # each datetime is built with one timedelta addition instead of a
+    # fromtimestamp call. The closure is shared by every reader thread,
+    # so each cache is held as a single tuple: a reference swap is
+    # atomic under the GIL, where paired nonlocals could be observed
+    # half updated.
+    last: Tuple[Optional[int], Optional[datetime]] = (None, None)
+    day: Tuple[int, Optional[datetime]] = (0, None)
+
+    def _from_timestamp(value: int) -> datetime:
+        nonlocal last, day
+        key, cached = last
+        if value != key:
+            day_start_us, day_start = day
+            microseconds = value // 1000
+            offset = microseconds - day_start_us
+            if day_start is None or not 0 <= offset < _US_PER_DAY:
+                day_start_us = microseconds - microseconds % _US_PER_DAY
+                day_start = _EPOCH + timedelta(microseconds=day_start_us)
+                offset = microseconds - day_start_us
+                day = (day_start_us, day_start)
+            cached = day_start + timedelta(microseconds=offset)
+            last = (value, cached)
+        return cached
+
+    return _from_timestamp
+
+
+_from_timestamp = _make_from_timestamp()
 
 
 def _from_event_time(value: int) -> datetime:
-    return datetime.fromtimestamp(value, tz=timezone.utc)
+    return _EPOCH + timedelta(seconds=value)
+
+
+# Prices are fixed point with four decimal places. Decimal values are
+# exact but cost far more to build than floats; use_decimal_prices
+# switches between the two.
+USE_DECIMAL_PRICES = True
+
+_PRICE_SCALE = Decimal(10 ** 4)
+
+
+def _make_from_price() -> Tuple[Callable[[int], Any], Callable[[], None]]:
+    # Price levels repeat as the book updates, so cache the last value.
+    # The flag is only consulted on a cache miss, where its cost
+    # disappears next to building the Decimal. Division by the cached
+    # constant is kept over multiplying by Decimal('0.0001'): the
+    # latter pins the exponent at -4 and would change the rendered form
+    # (171.2500 rather than 171.25).
+    # As with the timestamp cache, the key and value live in one tuple
+    # so readers on other threads never see a half-updated pair.
+    last: Tuple[Optional[int], Any] = (None, None)
+
+    def _from_price(value: int) -> Any:
+        nonlocal last
+        key, cached = last
+        if value != key:
+            if USE_DECIMAL_PRICES:
+                cached = Decimal(value) / _PRICE_SCALE
+            else:
+                cached = value * 1e-4
+            last = (value, cached)
+        return cached
+
+    def _reset() -> None:
+        nonlocal last
+        last = (None, None)
+
+    return _from_price, _reset
+
+
+_from_price, _reset_price_cache = _make_from_price()
+
+
+def use_decimal_prices(enabled: bool) -> None:
+    """Select exact Decimal prices (the default) or floats
+
+    Takes effect for messages decoded after the call, so set it before
+    iterating a Parser.
+    """
+    global USE_DECIMAL_PRICES
+    USE_DECIMAL_PRICES = enabled
+    _reset_price_cache()
 
 
-def _from_price(value: int) -> Decimal:
-    return Decimal(value) / 10 ** 4
+def _make_strip() -> Callable[[bytes], bytes]:
+    # Symbols and the other padded text fields recur constantly while
+    # their cardinality stays small, so the stripped form is cached
+    # keyed on the raw padded bytes. The cap is far above the number of
+    # listed symbols; it only guards against corrupt input filling the
+    # cache with junk.
+    cache: dict = {}
+    max_size = 0x10000
 
+    def _strip(value: bytes) -> bytes:
+        stripped = cache.get(value)
+        if stripped is None:
+            if len(cache) >= max_size:
+                cache.clear()
+            stripped = value.rstrip(b' \x00')
+            cache[value] = stripped
+        return stripped
 
-def _decode_system_event(buf: bytes) -> Mapping[str, Any]:
+    return _strip
+
+
+_strip = _make_strip()
+
+
+_SYSTEM_EVENT = struct.Struct('<1sq')
+
+
+def _decode_system_event(buf: bytes, offset: int = 0, _unpack=_SYSTEM_EVENT.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> Mapping[str, Any]:
     (
         system_event,
         timestamp
-    ) = struct.unpack('<1sq', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'system_event',
-        'event': system_event.strip(),
-        'timestamp': _from_timestamp(timestamp)
+        'event': _strip(system_event),
+        'timestamp': _ts(timestamp)
     }
 
 
-def _decode_security_directory(buf: bytes) -> Mapping[str, Any]:
+_SECURITY_DIRECTORY = struct.Struct('<Bq8sLqB')
+
+
+def _decode_security_directory(buf: bytes, offset: int = 0, _unpack=_SECURITY_DIRECTORY.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> Mapping[str, Any]:
     (
         flags,
         timestamp,
@@ -37,84 +150,105 @@ def _decode_security_directory(buf: bytes) -> Mapping[str, Any]:
         round_lot_size,
         adjusted_poc_close,
         luld_tier
-    ) = struct.unpack('<Bq8sLqB', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'security_directive',
         'flags': flags,
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
         'round_lot_size': round_lot_size,
         'adjusted_poc_close': adjusted_poc_close,
         'luld_tier': luld_tier
     }
 
 
-def _decode_trading_status(buf: bytes) -> Mapping[str, Any]:
+_TRADING_STATUS = struct.Struct('<1sq8s4s')
+
+
+def _decode_trading_status(buf: bytes, offset: int = 0, _unpack=_TRADING_STATUS.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> Mapping[str, Any]:
     (
         status,
         timestamp,
         symbol,
         reason
-    ) = struct.unpack('<1sq8s4s', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'trading_status',
-        'status': status.strip(),
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
-        'reason': reason.strip()
+        'status': _strip(status),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
+        'reason': _strip(reason)
     }
 
 
-def _decode_retail_liquidity_idicator(buf: bytes) -> Mapping[str, Any]:
+_RETAIL_LIQUIDITY_INDICATOR = struct.Struct('<1sq8s')
+
+
+def _decode_retail_liquidity_idicator(buf: bytes, offset: int = 0, _unpack=_RETAIL_LIQUIDITY_INDICATOR.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> Mapping[str, Any]:
     (
         indicator,
         timestamp,
         symbol,
-    ) = struct.unpack('<1sq8s', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'retail_liquidity_indicator',
-        'indicator': indicator.strip(),
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
+        'indicator': _strip(indicator),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
     }
 
 
-def _decode_operational_halt(buf: bytes) -> Mapping[str, Any]:
+_OPERATIONAL_HALT = struct.Struct('<1sq8s')
+
+
+def _decode_operational_halt(buf: bytes, offset: int = 0, _unpack=_OPERATIONAL_HALT.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> Mapping[str, Any]:
     (
         halt_status,
         timestamp,
         symbol
-    ) = struct.unpack('<1sq8s', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'operational_halt',
-        'halt_status': halt_status.strip(),
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip()
+        'halt_status': _strip(halt_status),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol)
     }
 
 
-def _decode_short_sale_price_test_status(buf: bytes) -> Mapping[str, Any]:
+_SHORT_SALE_PRICE_TEST_STATUS = struct.Struct('<Bq8s1s')
+
+
+def _decode_short_sale_price_test_status(buf: bytes, offset: int = 0, _unpack=_SHORT_SALE_PRICE_TEST_STATUS.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> Mapping[str, Any]:
     (
         status,
         timestamp,
         symbol,
         detail
-    ) = struct.unpack('<Bq8s1s', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'short_sale_price_test_status',
         'status': status,
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
-        'detail': detail.strip()
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
+        'detail': _strip(detail)
     }
 
 
-def _decode_quote_update(buf: bytes) -> Mapping[str, Any]:
+_QUOTE_UPDATE = struct.Struct('<Bq8sLqqL')
+
+
+def _decode_quote_update(buf: bytes, offset: int = 0, _unpack=_QUOTE_UPDATE.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price,
+                 _strip=_strip) -> Mapping[str, Any]:
     (
         flags,
         timestamp,
@@ -123,21 +257,26 @@ def _decode_quote_update(buf: bytes) -> Mapping[str, Any]:
         bid_price,
         ask_price,
         ask_size
-    ) = struct.unpack('<Bq8sLqqL', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'quote_update',
         'flags': flags,
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
         'bid_size': bid_size,
-        'bid_price': _from_price(bid_price),
+        'bid_price': _price(bid_price),
         'ask_size': ask_size,
-        'ask_price': _from_price(ask_price)
+        'ask_price': _price(ask_price)
     }
 
 
-def _decode_trade_report_tops_1_5(buf: bytes) -> Mapping[str, Any]:
+_TRADE_REPORT_TOPS_1_5 = struct.Struct('<Bq8sLqqL')
+
+
+def _decode_trade_report_tops_1_5(buf: bytes, offset: int = 0, _unpack=_TRADE_REPORT_TOPS_1_5.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price,
+                 _strip=_strip) -> Mapping[str, Any]:
     (
         flags,
         timestamp,
@@ -146,20 +285,25 @@ def _decode_trade_report_tops_1_5(buf: bytes) -> Mapping[str, Any]:
         price,
         trade_id,
         _reserved
-    ) = struct.unpack('<Bq8sLqqL', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'trade_report',
         'flags': flags,
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
         'size': size,
-        'price': _from_price(price),
+        'price': _price(price),
         'trade_id': trade_id
     }
 
 
-def _decode_trade_report_deep_1_0(buf: bytes) -> Mapping[str, Any]:
+_TRADE_REPORT_DEEP_1_0 = struct.Struct('<Bq8sLqq')
+
+
+def _decode_trade_report_deep_1_0(buf: bytes, offset: int = 0, _unpack=_TRADE_REPORT_DEEP_1_0.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price,
+                 _strip=_strip) -> Mapping[str, Any]:
     (
         flags,
         timestamp,
@@ -167,37 +311,47 @@ def _decode_trade_report_deep_1_0(buf: bytes) -> Mapping[str, Any]:
         size,
         price,
         trade_id
-    ) = struct.unpack('<Bq8sLqq', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'trade_report',
         'flags': flags,
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
         'size': size,
-        'price': _from_price(price),
+        'price': _price(price),
         'trade_id': trade_id
     }
 
 
-def _decode_official_price(buf: bytes) -> Mapping[str, Any]:
+_OFFICIAL_PRICE = struct.Struct('<1sq8sq')
+
+
+def _decode_official_price(buf: bytes, offset: int = 0, _unpack=_OFFICIAL_PRICE.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price,
+                 _strip=_strip) -> Mapping[str, Any]:
     (
         price_type,
         timestamp,
         symbol,
         price
-    ) = struct.unpack('<1sq8sq', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'official_price',
-        'price_type': price_type.strip(),
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
-        'price': _from_price(price)
+        'price_type': _strip(price_type),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
+        'price': _price(price)
     }
 
 
-def _decode_trade_break_tops_1_5(buf: bytes) -> Mapping[str, Any]:
+_TRADE_BREAK_TOPS_1_5 = struct.Struct('<1sq8sLqqL')
+
+
+def _decode_trade_break_tops_1_5(buf: bytes, offset: int = 0, _unpack=_TRADE_BREAK_TOPS_1_5.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price,
+                 _strip=_strip) -> Mapping[str, Any]:
     (
         flags,
         timestamp,
@@ -206,20 +360,25 @@ def _decode_trade_break_tops_1_5(buf: bytes) -> Mapping[str, Any]:
         price,
         trade_id,
         _reserved
-    ) = struct.unpack('<1sq8sLqqL', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'trade_break',
         'flags': flags,
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
         'size': size,
-        'price': _from_price(price),
+        'price': _price(price),
         'trade_id': trade_id
     }
 
 
-def _decode_trade_break_deep_1_0(buf: bytes) -> Mapping[str, Any]:
+_TRADE_BREAK_DEEP_1_0 = struct.Struct('<1sq8sLqq')
+
+
+def _decode_trade_break_deep_1_0(buf: bytes, offset: int = 0, _unpack=_TRADE_BREAK_DEEP_1_0.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price,
+                 _strip=_strip) -> Mapping[str, Any]:
     (
         flags,
         timestamp,
@@ -227,20 +386,25 @@ def _decode_trade_break_deep_1_0(buf: bytes) -> Mapping[str, Any]:
         size,
         price,
         trade_id,
-    ) = struct.unpack('<1sq8sLqq', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'trade_break',
         'flags': flags,
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
         'size': size,
-        'price': _from_price(price),
+        'price': _price(price),
         'trade_id': trade_id
     }
 
 
-def _decode_auction_information(buf: bytes) -> Mapping[str, Any]:
+_AUCTION_INFORMATION = struct.Struct('<1sq8sLqqL1sBLqqqq')
+
+
+def _decode_auction_information(buf: bytes, offset: int = 0, _unpack=_AUCTION_INFORMATION.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price,
+                 _strip=_strip) -> Mapping[str, Any]:
     (
         auction_type,
         timestamp,
@@ -256,69 +420,100 @@ def _decode_auction_information(buf: bytes) -> Mapping[str, Any]:
         collar_reference_price,
         lower_auction_collar_price,
         upper_auction_collar_price
-    ) = struct.unpack('<1sq8sLqqL1sBLqqqq', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'auction_information',
-        'auction_type': auction_type.strip(),
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
+        'auction_type': _strip(auction_type),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
         'paired_shares': paired_shares,
-        'reference_price': _from_price(reference_price),
-        'indicative_clearing_price': _from_price(indicative_clearing_price),
+        'reference_price': _price(reference_price),
+        'indicative_clearing_price': _price(indicative_clearing_price),
         'imbalance_shares': imbalance_shares,
-        'imbalance_side': imbalance_side.strip(),
+        'imbalance_side': _strip(imbalance_side),
         'extension_number': extension_number,
         'scheduled_auction_time': _from_event_time(scheduled_auction_time),
-        'auction_book_clearing_price': _from_price(auction_book_clearing_price),
-        'collar_reference_price': _from_price(collar_reference_price),
-        'lower_auction_collar_price': _from_price(lower_auction_collar_price),
-        'upper_auction_collar_price': _from_price(upper_auction_collar_price)
+        'auction_book_clearing_price': _price(auction_book_clearing_price),
+        'collar_reference_price': _price(collar_reference_price),
+        'lower_auction_collar_price': _price(lower_auction_collar_price),
+        'upper_auction_collar_price': _price(upper_auction_collar_price)
     }
 
 
-def _decode_price_level_update(side: bytes, buf: bytes) -> Mapping[str, Any]:
+_PRICE_LEVEL_UPDATE = struct.Struct('<Bq8sIq')
+
+
+def _decode_price_level_update_buy(buf: bytes, offset: int = 0, _unpack=_PRICE_LEVEL_UPDATE.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price,
+                 _strip=_strip) -> Mapping[str, Any]:
     (
         flags,
         timestamp,
         symbol,
         size,
         price
-    ) = struct.unpack('<Bq8sIq', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'price_level_update',
-        'side': side,
+        'side': b'B',
         'flags': flags,
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip(),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
         'size': size,
-        'price': _from_price(price)
+        'price': _price(price)
     }
 
 
-def _decode_security_event_message(buf: bytes) -> Mapping[str, Any]:
+def _decode_price_level_update_sell(buf: bytes, offset: int = 0, _unpack=_PRICE_LEVEL_UPDATE.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price,
+                 _strip=_strip) -> Mapping[str, Any]:
+    (
+        flags,
+        timestamp,
+        symbol,
+        size,
+        price
+    ) = _unpack(buf, offset)
+
+    return {
+        'type': 'price_level_update',
+        'side': b'S',
+        'flags': flags,
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol),
+        'size': size,
+        'price': _price(price)
+    }
+
+
+_SECURITY_EVENT_MESSAGE = struct.Struct('<1sq8s')
+
+
+def _decode_security_event_message(buf: bytes, offset: int = 0, _unpack=_SECURITY_EVENT_MESSAGE.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> Mapping[str, Any]:
     (
         event,
         timestamp,
         symbol
-    ) = struct.unpack('<1sq8s', buf)
+    ) = _unpack(buf, offset)
 
     return {
         'type': 'security_event',
-        'security_event': event.strip(),
-        'timestamp': _from_timestamp(timestamp),
-        'symbol': symbol.strip()
+        'security_event': _strip(event),
+        'timestamp': _ts(timestamp),
+        'symbol': _strip(symbol)
     }
 
 
-_DECODERS_TOPS_1_5: Mapping[int, Callable[[bytes], Mapping[str, Any]]] = {
+_DECODERS_TOPS_1_5: Mapping[int, Callable[[bytes, int], Mapping[str, Any]]] = {
     0x51: _decode_quote_update,
     0x54: _decode_trade_report_tops_1_5,
     0x42: _decode_trade_break_tops_1_5,
 }
 
-_DECODERS_DEEP_1_0: Mapping[int, Callable[[bytes], Mapping[str, Any]]] = {
+_DECODERS_DEEP_1_0: Mapping[int, Callable[[bytes, int], Mapping[str, Any]]] = {
     0x53: _decode_system_event,
     0x44: _decode_security_directory,
     0x48: _decode_trading_status,
@@ -330,8 +525,8 @@ _DECODERS_DEEP_1_0: Mapping[int, Callable[[bytes], Mapping[str, Any]]] = {
     0x58: _decode_official_price,
     0x42: _decode_trade_break_deep_1_0,
     0x41: _decode_auction_information,
-    0x38: lambda buf: _decode_price_level_update(b'B', buf),
-    0x35: lambda buf: _decode_price_level_update(b'S', buf),
+    0x38: _decode_price_level_update_buy,
+    0x35: _decode_price_level_update_sell,
     0x45: _decode_security_event_message
 }
 
@@ -341,12 +536,45 @@ DEEP_1_0 = 'DEEPv1.0'
 TOPS_1_6 = 'TOPSv1.6'
 TOPS_1_5 = 'TOPSv1.5'
 
-_VERSIONED_DECODERS: Mapping[str, Mapping[int, Callable[[bytes], Mapping[str, Any]]]] = {
+_VERSIONED_DECODERS: Mapping[str, Mapping[int, Callable[[bytes, int], Mapping[str, Any]]]] = {
     DEEP_1_0: _DECODERS_DEEP_1_0,
     TOPS_1_6: _DECODERS_TOPS_1_6,
     TOPS_1_5: _DECODERS_TOPS_1_5
 }
 
 
-def decode_message(version: str, message_type: int, buf: bytes) -> Mapping[str, Any]:
-    return _VERSIONED_DECODERS[version][message_type](buf)
+def _as_decoder_table(
+        decoders: Mapping[int, Callable[[bytes, int], Mapping[str, Any]]]
+) -> List[Optional[Callable[[bytes, int], Mapping[str, Any]]]]:
+    # Message types are single bytes, so a dense list indexed by the
+    # type avoids a dict lookup per message.
+    table: List[Optional[Callable[[bytes, int], Mapping[str, Any]]]] = [None] * 256
+    for message_type, decoder in decoders.items():
+        table[message_type] = decoder
+    return table
+
+
+_VERSIONED_DECODER_TABLES: Mapping[str, List[Optional[Callable[[bytes, int], Mapping[str, Any]]]]] = {
+    version: _as_decoder_table(decoders)
+    for version, decoders in _VERSIONED_DECODERS.items()
+}
+
+
+def decoder_table(
+        version: str
+) -> List[Optional[Callable[[bytes, int], Mapping[str, Any]]]]:
+    """Return the dense decoder table for a protocol version
+
+    The table is indexed by the message type byte, letting callers bind
+    it once and skip the per-message version lookup.
+    """
+    return _VERSIONED_DECODER_TABLES[version]
+
+
+def decode_message(
+        version: str,
+        message_type: int,
+        buf: bytes,
+        offset: int = 0
+) -> Mapping[str, Any]:
+    return _VERSIONED_DECODER_TABLES[version][message_type](buf, offset)
@@ -1,20 +1,149 @@
 """The parser"""
 
+import gzip
 import logging
 import queue
 import struct
 import threading
-from typing import NamedTuple, Mapping, Optional, List, Any
+from typing import NamedTuple, Optional, List, Any
 
-from scapy.all import PcapReader, Packet
-from scapy.layers.l2 import Ether
-from scapy.layers.inet import UDP
-
-from .messages import decode_message
+from .messages import decoder_table
+from .typed_messages import typed_decoder_table
 
 logger = logging.getLogger(__name__)
 
 
+class RawPcapReader:
+    """Reads UDP payloads straight from a pcap or pcapng file
+
+    The IEX files only ever contain UDP over IPv4 over Ethernet, so
+    there is no need to dissect each frame: the link and transport
+    headers are validated in place and the UDP payload is returned as a
+    memoryview at a computed offset. Gzipped files are detected from
+    the magic bytes and decompressed on the fly.
+    """
+
+    PCAP_MAGICS = {
+        b'\xd4\xc3\xb2\xa1': '<',
+        b'\x4d\x3c\xb2\xa1': '<',
+        b'\xa1\xb2\xc3\xd4': '>',
+        b'\xa1\xb2\x3c\x4d': '>',
+    }
+    PCAPNG_MAGIC = b'\x0a\x0d\x0d\x0a'
+    LINKTYPE_ETHERNET = 1
+    ENHANCED_PACKET_BLOCK = 0x00000006
+    SECTION_HEADER_BLOCK = 0x0a0d0d0a
+
+    ETHERNET_SIZE = 14
+    IP_HEADER_SIZE = 20
+    UDP_HEADER_SIZE = 8
+    IP_PROTOCOL_UDP = 17
+
+    def __init__(self, filename: str) -> None:
+        self._raw = open(filename, 'rb')
+        if self._raw.read(2) == b'\x1f\x8b':
+            self._raw.seek(0)
+            self.file = gzip.GzipFile(fileobj=self._raw)
+        else:
+            self._raw.seek(0)
+            self.file = self._raw
+
+        # Computed from the first valid frame and reused thereafter.
+        self._payload_start = 0
+
+        magic = self.file.read(4)
+        if magic == self.PCAPNG_MAGIC:
+            self._init_pcapng()
+            self._next_payload = self._next_payload_pcapng
+        elif magic in self.PCAP_MAGICS:
+            self._init_pcap(self.PCAP_MAGICS[magic])
+            self._next_payload = self._next_payload_pcap
+        else:
+            raise ValueError('Not a pcap file')
+
+    def _init_pcap(self, endianness: str) -> None:
+        header = self.file.read(20)
+        network = struct.unpack(endianness + 'HHiIII', header)[5]
+        if network != self.LINKTYPE_ETHERNET:
+            raise ValueError(f'Unsupported link type {network}')
+        self._record_header = struct.Struct(endianness + 'IIII')
+
+    def _init_pcapng(self) -> None:
+        header = self.file.read(8)
+        endianness = '<' if header[4:8] == b'\x4d\x3c\x2b\x1a' else '>'
+        self._set_pcapng_endianness(endianness)
+        block_length = struct.unpack(endianness + 'I', header[:4])[0]
+        self.file.read(block_length - 12)
+
+    def _set_pcapng_endianness(self, endianness: str) -> None:
+        self._block_header = struct.Struct(endianness + 'II')
+        self._packet_header = struct.Struct(endianness + 'IIIII')
+
+    def _next_payload_pcap(self) -> Optional[memoryview]:
+        read = self.file.read
+        while True:
+            header = read(16)
+            if len(header) < 16:
+                return None
+            included_length = self._record_header.unpack(header)[2]
+            record = read(included_length)
+            if len(record) < included_length:
+                return None
+            payload = self._udp_payload(record)
+            if payload is not None:
+                return payload
+
+    def _next_payload_pcapng(self) -> Optional[memoryview]:
+        read = self.file.read
+        while True:
+            header = read(8)
+            if len(header) < 8:
+                return None
+            block_type, block_length = self._block_header.unpack(header)
+            body = read(block_length - 8)
+            if len(body) < block_length - 8:
+                return None
+            if block_type == self.ENHANCED_PACKET_BLOCK:
+                captured_length = self._packet_header.unpack_from(body, 0)[3]
+                record = body[20:20 + captured_length]
+                payload = self._udp_payload(record)
+                if payload is not None:
+                    return payload
+            elif block_type == self.SECTION_HEADER_BLOCK:
+                endianness = '<' if body[:4] == b'\x4d\x3c\x2b\x1a' else '>'
+                self._set_pcapng_endianness(endianness)
+
+    def _udp_payload(self, record: bytes) -> Optional[memoryview]:
+        minimum = self.ETHERNET_SIZE + self.IP_HEADER_SIZE + self.UDP_HEADER_SIZE
+        if len(record) < minimum:
+            return None
+        # EtherType IPv4, then the IP protocol field. These two guards
+        # stay per record so a stray frame is skipped, not mis-sliced.
+        if record[12] != 0x08 or record[13] != 0x00:
+            return None
+        if record[23] != self.IP_PROTOCOL_UDP:
+            return None
+        start = self._payload_start
+        if not start:
+            # An IEX feed is one multicast stream whose sender never
+            # varies its IP options, so the offset from the first valid
+            # frame holds for the rest of the file.
+            ip_header_size = (record[self.ETHERNET_SIZE] & 0x0f) * 4
+            start = self.ETHERNET_SIZE + ip_header_size + self.UDP_HEADER_SIZE
+            self._payload_start = start
+        # The IP total length excludes any link-layer padding.
+        end = self.ETHERNET_SIZE + ((record[16] << 8) | record[17])
+        return memoryview(record)[start:end]
+
+    def read_payload(self) -> Optional[memoryview]:
+        """Return the next UDP payload, or None at the end of the file"""
+        return self._next_payload()
+
+    def close(self) -> None:
+        self.file.close()
+        self._raw.close()
+
+
 class Header(NamedTuple):
     """
     Version                        0 1 Byte      1 (0x1) Version of Transport specification
@@ -41,101 +170,143 @@ class Header(NamedTuple):
 
 class DeepPcapReader:
 
-    def __init__(self, reader: PcapReader, protocol: str, queue_length) -> None:
+    def __init__(
+            self,
+            reader: RawPcapReader,
+            protocol: str,
+            queue_length,
+            typed: bool = False
+    ) -> None:
         self.reader = reader
         self.protocol = protocol
+        # Binding the decoder table here removes the per-message
+        # protocol version lookup from the decode loop.
+        self.decoders = (
+            typed_decoder_table(protocol) if typed
+            else decoder_table(protocol)
+        )
+        # The queue carries one batch of messages per packet, so the
+        # lock and condition variable are paid once per packet rather
+        # than once per message. queue_length counts packets.
         self.messages = queue.Queue(queue_length)
         self.sentinal = object()
+        # Raw payloads pass from the reader thread to the decode thread
+        # through their own queue. Reading is mostly gzip inflation and
+        # file I/O, which release the GIL, so the two stages genuinely
+        # overlap.
+        self.payloads = queue.Queue(queue_length)
         self.cancellation_token = threading.Event()
+        self.read_thread = threading.Thread(target=self._read_payloads)
         self.fill_thread = threading.Thread(target=self._fill)
+        self.batch: List[Any] = []
+        self.batch_index = 0
 
     def __iter__(self):
+        self.read_thread.start()
         self.fill_thread.start()
         return self
 
-    def __next__(self) -> Mapping[str, Any]:
-        message = self.messages.get()
-        if message == self.sentinal:
-            self.fill_thread.join()
-            raise StopIteration
+    def __next__(self) -> Any:
+        while self.batch_index >= len(self.batch):
+            batch = self.messages.get()
+            if batch is self.sentinal:
+                self.read_thread.join()
+                self.fill_thread.join()
+                raise StopIteration
+            self.batch = batch
+            self.batch_index = 0
+        message = self.batch[self.batch_index]
+        self.batch_index += 1
         return message
 
+    def _read_payloads(self) -> None:
+        # Bind the per-packet lookups as locals: attribute loads in
+        # this loop run once per packet for the life of the file.
+        read_payload = self.reader.read_payload
+        put = self.payloads.put
+        is_cancelled = self.cancellation_token.is_set
+
+        while not is_cancelled():
+            buf = read_payload()
+            put(buf)
+            if buf is None:
+                logging.debug('All packets read')
+                return
+
     def _fill(self) -> None:
-        is_eof = False
-
-        while not (is_eof or self.cancellation_token.is_set()):
-            logging.debug(
-                'Reading packet: len(queue)=%s',
-                self.messages.qsize()
-            )
-            try:
-                packet: Packet = self.reader.read_packet()
-                if packet is None:
-                    logging.debug('Read empty packet and assuming EOF')
-                    raise EOFError
-            except EOFError:
-                logging.debug('End of file')
-                is_eof = True
-                self.messages.put(self.sentinal)
-                continue
-
-            if isinstance(packet, Ether) and packet.haslayer(UDP):
-                layer: UDP = packet[UDP]
-                buf = layer.payload.load
-                messages = self._read(buf)
-                if messages is not None:
-                    for message in messages:
-                        self.messages.put(message)
-
-        logging.debug('All packets read')
-
-    HEADER_PATTERN = '<BxHIIHHqqq'
-    HEADER_SIZE = struct.calcsize(HEADER_PATTERN)
-    MESSAGE_LENGTH_PATTERN = '<h'
-    MESSAGE_LENGTH_SIZE = struct.calcsize(MESSAGE_LENGTH_PATTERN)
-
-    def _read(self, buf: bytes) -> Optional[List[Mapping[str, Any]]]:
+        get = self.payloads.get
+        read = self._read
+        put = self.messages.put
+        is_cancelled = self.cancellation_token.is_set
+
+        while not is_cancelled():
+            buf = get()
+            if buf is None:
+                logging.debug('All packets decoded')
+                put(self.sentinal)
+                return
+
+            messages = read(buf)
+            if messages is not None:
+                put(messages)
+
+    HEADER_STRUCT = struct.Struct('<BxHIIHHqqq')
+    HEADER_SIZE = HEADER_STRUCT.size
+    # Only two of the nine header fields steer the read loop, so they
+    # are unpacked on their own rather than through a Header instance.
+    HEADER_COUNTS_STRUCT = struct.Struct('<12xHH')
+    MESSAGE_LENGTH_STRUCT = struct.Struct('<H')
+    MESSAGE_LENGTH_SIZE = MESSAGE_LENGTH_STRUCT.size
+
+    def _read(self, buf: memoryview) -> Optional[List[Any]]:
         # Read the header.
-        header = Header(
-            *struct.unpack(self.HEADER_PATTERN,
-                           buf[:self.HEADER_SIZE])
-        )
-        if len(buf) != self.HEADER_SIZE + header.payload_length:
+        payload_length, message_count = self.HEADER_COUNTS_STRUCT.unpack_from(buf, 0)
+        if len(buf) != self.HEADER_SIZE + payload_length:
             raise RuntimeError('Invalid payload')
-        if header.payload_length == 0:
+        if payload_length == 0:
             return None
 
-        # Read the messages.
-        messages = []
+        # Read the messages. Decoding from a memoryview at an offset
+        # avoids allocating a bytes slice per message, and the dispatch
+        # runs on locals rather than attribute lookups. The message
+        # count is known up front, so the list is allocated at its
+        # final size rather than grown by appending.
+        messages: List[Any] = [None] * message_count
+        decoders = self.decoders
+        unpack_length = self.MESSAGE_LENGTH_STRUCT.unpack_from
+        length_size = self.MESSAGE_LENGTH_SIZE
+        view = memoryview(buf)
         start = self.HEADER_SIZE
-        for _message_number in range(header.message_count):
-            end = start + self.MESSAGE_LENGTH_SIZE
-            message_length = struct.unpack("<H", buf[start:end])[0]
-            start = end
-            end += message_length
-            message = self._parse_message(buf[start:end])
-            messages.append(message)
-            start = end
+        for message_number in range(message_count):
+            message_length = unpack_length(buf, start)[0]
+            start += length_size
+            messages[message_number] = decoders[view[start]](view, start + 1)
+            start += message_length
 
         return messages
 
-    def _parse_message(self, buf: bytes) -> Mapping[str, Any]:
-        message_type = buf[0]
-        message_body = buf[1:]
-        return decode_message(self.protocol, message_type, message_body)
-
 
 class Parser:
 
-    # noinspection PyArgumentList
-    def __init__(self, filename: str, protocol: str, queue_length=25000) -> None:
-        self.reader = PcapReader(filename)
+    def __init__(
+            self,
+            filename: str,
+            protocol: str,
+            queue_length=25000,
+            typed: bool = False
+    ) -> None:
+        self.reader = RawPcapReader(filename)
         self.protocol = protocol
         self.queue_length = queue_length
+        self.typed = typed
 
     def __enter__(self) -> DeepPcapReader:
-        self.reader.__enter__()
-        return DeepPcapReader(self.reader, self.protocol, self.queue_length)
+        return DeepPcapReader(
+            self.reader,
+            self.protocol,
+            self.queue_length,
+            self.typed
+        )
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.reader.__exit__(exc_type, exc_val, exc_tb)
+        self.reader.close()
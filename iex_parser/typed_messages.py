@@ -0,0 +1,534 @@
+"""Typed messages
+
+NamedTuple equivalents of the dict messages. A NamedTuple is several
+times smaller than a dict and its fields are read by attribute, so this
+is the faster path when every message is kept or handed to analytics
+code. Pass ``typed=True`` to ``Parser`` to receive these instead of
+dicts. The field names match the dict keys, with the ``'type'`` key
+becoming a ``type`` attribute.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Mapping, NamedTuple, Optional
+
+from .messages import (
+    DEEP_1_0,
+    TOPS_1_5,
+    TOPS_1_6,
+    _AUCTION_INFORMATION,
+    _OFFICIAL_PRICE,
+    _OPERATIONAL_HALT,
+    _PRICE_LEVEL_UPDATE,
+    _QUOTE_UPDATE,
+    _RETAIL_LIQUIDITY_INDICATOR,
+    _SECURITY_DIRECTORY,
+    _SECURITY_EVENT_MESSAGE,
+    _SHORT_SALE_PRICE_TEST_STATUS,
+    _SYSTEM_EVENT,
+    _TRADE_BREAK_DEEP_1_0,
+    _TRADE_BREAK_TOPS_1_5,
+    _TRADE_REPORT_DEEP_1_0,
+    _TRADE_REPORT_TOPS_1_5,
+    _TRADING_STATUS,
+    _from_event_time,
+    _from_price,
+    _from_timestamp,
+    _strip,
+)
+
+
+class SystemEvent(NamedTuple):
+    event: bytes
+    timestamp: datetime
+    type: str = 'system_event'
+
+
+class SecurityDirectory(NamedTuple):
+    flags: int
+    timestamp: datetime
+    symbol: bytes
+    round_lot_size: int
+    adjusted_poc_close: int
+    luld_tier: int
+    type: str = 'security_directive'
+
+
+class TradingStatus(NamedTuple):
+    status: bytes
+    timestamp: datetime
+    symbol: bytes
+    reason: bytes
+    type: str = 'trading_status'
+
+
+class RetailLiquidityIndicator(NamedTuple):
+    indicator: bytes
+    timestamp: datetime
+    symbol: bytes
+    type: str = 'retail_liquidity_indicator'
+
+
+class OperationalHalt(NamedTuple):
+    halt_status: bytes
+    timestamp: datetime
+    symbol: bytes
+    type: str = 'operational_halt'
+
+
+class ShortSalePriceTestStatus(NamedTuple):
+    status: int
+    timestamp: datetime
+    symbol: bytes
+    detail: bytes
+    type: str = 'short_sale_price_test_status'
+
+
+class QuoteUpdate(NamedTuple):
+    flags: int
+    timestamp: datetime
+    symbol: bytes
+    bid_size: int
+    bid_price: Decimal
+    ask_size: int
+    ask_price: Decimal
+    type: str = 'quote_update'
+
+
+class TradeReport(NamedTuple):
+    flags: int
+    timestamp: datetime
+    symbol: bytes
+    size: int
+    price: Decimal
+    trade_id: int
+    type: str = 'trade_report'
+
+
+class OfficialPrice(NamedTuple):
+    price_type: bytes
+    timestamp: datetime
+    symbol: bytes
+    price: Decimal
+    type: str = 'official_price'
+
+
+class TradeBreak(NamedTuple):
+    flags: bytes
+    timestamp: datetime
+    symbol: bytes
+    size: int
+    price: Decimal
+    trade_id: int
+    type: str = 'trade_break'
+
+
+class AuctionInformation(NamedTuple):
+    auction_type: bytes
+    timestamp: datetime
+    symbol: bytes
+    paired_shares: int
+    reference_price: Decimal
+    indicative_clearing_price: Decimal
+    imbalance_shares: int
+    imbalance_side: bytes
+    extension_number: int
+    scheduled_auction_time: datetime
+    auction_book_clearing_price: Decimal
+    collar_reference_price: Decimal
+    lower_auction_collar_price: Decimal
+    upper_auction_collar_price: Decimal
+    type: str = 'auction_information'
+
+
+class PriceLevelUpdate(NamedTuple):
+    side: bytes
+    flags: int
+    timestamp: datetime
+    symbol: bytes
+    size: int
+    price: Decimal
+    type: str = 'price_level_update'
+
+
+class SecurityEvent(NamedTuple):
+    security_event: bytes
+    timestamp: datetime
+    symbol: bytes
+    type: str = 'security_event'
+
+
+def _decode_system_event(buf: bytes, offset: int = 0, _unpack=_SYSTEM_EVENT.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> SystemEvent:
+    (
+        system_event,
+        timestamp
+    ) = _unpack(buf, offset)
+
+    return SystemEvent(_strip(system_event), _ts(timestamp))
+
+
+def _decode_security_directory(buf: bytes, offset: int = 0, _unpack=_SECURITY_DIRECTORY.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> SecurityDirectory:
+    (
+        flags,
+        timestamp,
+        symbol,
+        round_lot_size,
+        adjusted_poc_close,
+        luld_tier
+    ) = _unpack(buf, offset)
+
+    return SecurityDirectory(
+        flags,
+        _ts(timestamp),
+        _strip(symbol),
+        round_lot_size,
+        adjusted_poc_close,
+        luld_tier
+    )
+
+
+def _decode_trading_status(buf: bytes, offset: int = 0, _unpack=_TRADING_STATUS.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> TradingStatus:
+    (
+        status,
+        timestamp,
+        symbol,
+        reason
+    ) = _unpack(buf, offset)
+
+    return TradingStatus(
+        _strip(status),
+        _ts(timestamp),
+        _strip(symbol),
+        _strip(reason)
+    )
+
+
+def _decode_retail_liquidity_idicator(buf: bytes, offset: int = 0, _unpack=_RETAIL_LIQUIDITY_INDICATOR.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> RetailLiquidityIndicator:
+    (
+        indicator,
+        timestamp,
+        symbol,
+    ) = _unpack(buf, offset)
+
+    return RetailLiquidityIndicator(
+        _strip(indicator),
+        _ts(timestamp),
+        _strip(symbol)
+    )
+
+
+def _decode_operational_halt(buf: bytes, offset: int = 0, _unpack=_OPERATIONAL_HALT.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> OperationalHalt:
+    (
+        halt_status,
+        timestamp,
+        symbol
+    ) = _unpack(buf, offset)
+
+    return OperationalHalt(
+        _strip(halt_status),
+        _ts(timestamp),
+        _strip(symbol)
+    )
+
+
+def _decode_short_sale_price_test_status(buf: bytes, offset: int = 0, _unpack=_SHORT_SALE_PRICE_TEST_STATUS.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> ShortSalePriceTestStatus:
+    (
+        status,
+        timestamp,
+        symbol,
+        detail
+    ) = _unpack(buf, offset)
+
+    return ShortSalePriceTestStatus(
+        status,
+        _ts(timestamp),
+        _strip(symbol),
+        _strip(detail)
+    )
+
+
+def _decode_quote_update(buf: bytes, offset: int = 0, _unpack=_QUOTE_UPDATE.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price, _strip=_strip) -> QuoteUpdate:
+    (
+        flags,
+        timestamp,
+        symbol,
+        bid_size,
+        bid_price,
+        ask_price,
+        ask_size
+    ) = _unpack(buf, offset)
+
+    return QuoteUpdate(
+        flags,
+        _ts(timestamp),
+        _strip(symbol),
+        bid_size,
+        _price(bid_price),
+        ask_size,
+        _price(ask_price)
+    )
+
+
+def _decode_trade_report_tops_1_5(buf: bytes, offset: int = 0, _unpack=_TRADE_REPORT_TOPS_1_5.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price, _strip=_strip) -> TradeReport:
+    (
+        flags,
+        timestamp,
+        symbol,
+        size,
+        price,
+        trade_id,
+        _reserved
+    ) = _unpack(buf, offset)
+
+    return TradeReport(
+        flags,
+        _ts(timestamp),
+        _strip(symbol),
+        size,
+        _price(price),
+        trade_id
+    )
+
+
+def _decode_trade_report_deep_1_0(buf: bytes, offset: int = 0, _unpack=_TRADE_REPORT_DEEP_1_0.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price, _strip=_strip) -> TradeReport:
+    (
+        flags,
+        timestamp,
+        symbol,
+        size,
+        price,
+        trade_id
+    ) = _unpack(buf, offset)
+
+    return TradeReport(
+        flags,
+        _ts(timestamp),
+        _strip(symbol),
+        size,
+        _price(price),
+        trade_id
+    )
+
+
+def _decode_official_price(buf: bytes, offset: int = 0, _unpack=_OFFICIAL_PRICE.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price, _strip=_strip) -> OfficialPrice:
+    (
+        price_type,
+        timestamp,
+        symbol,
+        price
+    ) = _unpack(buf, offset)
+
+    return OfficialPrice(
+        _strip(price_type),
+        _ts(timestamp),
+        _strip(symbol),
+        _price(price)
+    )
+
+
+def _decode_trade_break_tops_1_5(buf: bytes, offset: int = 0, _unpack=_TRADE_BREAK_TOPS_1_5.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price, _strip=_strip) -> TradeBreak:
+    (
+        flags,
+        timestamp,
+        symbol,
+        size,
+        price,
+        trade_id,
+        _reserved
+    ) = _unpack(buf, offset)
+
+    return TradeBreak(
+        flags,
+        _ts(timestamp),
+        _strip(symbol),
+        size,
+        _price(price),
+        trade_id
+    )
+
+
+def _decode_trade_break_deep_1_0(buf: bytes, offset: int = 0, _unpack=_TRADE_BREAK_DEEP_1_0.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price, _strip=_strip) -> TradeBreak:
+    (
+        flags,
+        timestamp,
+        symbol,
+        size,
+        price,
+        trade_id,
+    ) = _unpack(buf, offset)
+
+    return TradeBreak(
+        flags,
+        _ts(timestamp),
+        _strip(symbol),
+        size,
+        _price(price),
+        trade_id
+    )
+
+
+def _decode_auction_information(buf: bytes, offset: int = 0, _unpack=_AUCTION_INFORMATION.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price, _strip=_strip) -> AuctionInformation:
+    (
+        auction_type,
+        timestamp,
+        symbol,
+        paired_shares,
+        reference_price,
+        indicative_clearing_price,
+        imbalance_shares,
+        imbalance_side,
+        extension_number,
+        scheduled_auction_time,
+        auction_book_clearing_price,
+        collar_reference_price,
+        lower_auction_collar_price,
+        upper_auction_collar_price
+    ) = _unpack(buf, offset)
+
+    return AuctionInformation(
+        _strip(auction_type),
+        _ts(timestamp),
+        _strip(symbol),
+        paired_shares,
+        _price(reference_price),
+        _price(indicative_clearing_price),
+        imbalance_shares,
+        _strip(imbalance_side),
+        extension_number,
+        _from_event_time(scheduled_auction_time),
+        _price(auction_book_clearing_price),
+        _price(collar_reference_price),
+        _price(lower_auction_collar_price),
+        _price(upper_auction_collar_price)
+    )
+
+
+def _decode_price_level_update_buy(buf: bytes, offset: int = 0, _unpack=_PRICE_LEVEL_UPDATE.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price, _strip=_strip) -> PriceLevelUpdate:
+    (
+        flags,
+        timestamp,
+        symbol,
+        size,
+        price
+    ) = _unpack(buf, offset)
+
+    return PriceLevelUpdate(
+        b'B',
+        flags,
+        _ts(timestamp),
+        _strip(symbol),
+        size,
+        _price(price)
+    )
+
+
+def _decode_price_level_update_sell(buf: bytes, offset: int = 0, _unpack=_PRICE_LEVEL_UPDATE.unpack_from,
+                 _ts=_from_timestamp, _price=_from_price, _strip=_strip) -> PriceLevelUpdate:
+    (
+        flags,
+        timestamp,
+        symbol,
+        size,
+        price
+    ) = _unpack(buf, offset)
+
+    return PriceLevelUpdate(
+        b'S',
+        flags,
+        _ts(timestamp),
+        _strip(symbol),
+        size,
+        _price(price)
+    )
+
+
+def _decode_security_event_message(buf: bytes, offset: int = 0, _unpack=_SECURITY_EVENT_MESSAGE.unpack_from,
+                 _ts=_from_timestamp, _strip=_strip) -> SecurityEvent:
+    (
+        event,
+        timestamp,
+        symbol
+    ) = _unpack(buf, offset)
+
+    return SecurityEvent(
+        _strip(event),
+        _ts(timestamp),
+        _strip(symbol)
+    )
+
+
+_TYPED_DECODERS_TOPS_1_5: Mapping[int, Callable[[bytes, int], Any]] = {
+    0x51: _decode_quote_update,
+    0x54: _decode_trade_report_tops_1_5,
+    0x42: _decode_trade_break_tops_1_5,
+}
+
+_TYPED_DECODERS_DEEP_1_0: Mapping[int, Callable[[bytes, int], Any]] = {
+    0x53: _decode_system_event,
+    0x44: _decode_security_directory,
+    0x48: _decode_trading_status,
+    0x49: _decode_retail_liquidity_idicator,
+    0x4f: _decode_operational_halt,
+    0x50: _decode_short_sale_price_test_status,
+    0x51: _decode_quote_update,
+    0x54: _decode_trade_report_deep_1_0,
+    0x58: _decode_official_price,
+    0x42: _decode_trade_break_deep_1_0,
+    0x41: _decode_auction_information,
+    0x38: _decode_price_level_update_buy,
+    0x35: _decode_price_level_update_sell,
+    0x45: _decode_security_event_message
+}
+
+_TYPED_DECODERS_TOPS_1_6 = _TYPED_DECODERS_DEEP_1_0
+
+_VERSIONED_TYPED_DECODERS: Mapping[str, Mapping[int, Callable[[bytes, int], Any]]] = {
+    DEEP_1_0: _TYPED_DECODERS_DEEP_1_0,
+    TOPS_1_6: _TYPED_DECODERS_TOPS_1_6,
+    TOPS_1_5: _TYPED_DECODERS_TOPS_1_5
+}
+
+
+def _as_decoder_table(
+        decoders: Mapping[int, Callable[[bytes, int], Any]]
+) -> List[Optional[Callable[[bytes, int], Any]]]:
+    table: List[Optional[Callable[[bytes, int], Any]]] = [None] * 256
+    for message_type, decoder in decoders.items():
+        table[message_type] = decoder
+    return table
+
+
+_VERSIONED_TYPED_DECODER_TABLES: Mapping[str, List[Optional[Callable[[bytes, int], Any]]]] = {
+    version: _as_decoder_table(decoders)
+    for version, decoders in _VERSIONED_TYPED_DECODERS.items()
+}
+
+
+def typed_decoder_table(
+        version: str
+) -> List[Optional[Callable[[bytes, int], Any]]]:
+    """Return the dense typed decoder table for a protocol version"""
+    return _VERSIONED_TYPED_DECODER_TABLES[version]
+
+
+def decode_typed_message(
+        version: str,
+        message_type: int,
+        buf: bytes,
+        offset: int = 0
+) -> Any:
+    return _VERSIONED_TYPED_DECODER_TABLES[version][message_type](buf, offset)